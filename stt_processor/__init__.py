@@ -18,7 +18,7 @@ __version__ = "1.0.0"
 __author__ = "Pipeline STT Team"
 
 from .main import STTProcessor
-from .models import TranscriptionResult, SpeakerSegment, ProcessingJob
+from .models import TranscriptionResult, SpeakerSegment, ProcessingJob, Word
 from .config import STTConfig
 
 __all__ = [
@@ -26,5 +26,6 @@ __all__ = [
     "TranscriptionResult", 
     "SpeakerSegment",
     "ProcessingJob",
+    "Word",
     "STTConfig"
 ]
\ No newline at end of file
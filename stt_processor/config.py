@@ -3,11 +3,30 @@ Configuration management for STT processor.
 """
 
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
 
+# Allowed values, built once at import for O(1) membership checks
+_SUPPORTED_FORMATS = frozenset({".mp3", ".wav", ".m4a", ".flac", ".ogg", ".mp4", ".avi", ".mov"})
+_ALLOWED_MODELS = frozenset({"tiny", "base", "small", "medium", "large", "large-v2", "large-v3"})
+_ALLOWED_COMPUTE_TYPES = frozenset({"auto", "int8", "int8_float16", "float16", "bfloat16", "float32"})
+_ALLOWED_BACKENDS = frozenset({"whisperx", "whisper_blaze"})
+_ALLOWED_LANGUAGES = frozenset({"pt", "en", "es", "auto"})
+_ALLOWED_TASKS = frozenset({"transcribe", "translate"})
+
+
+def _env_to(cast: Callable[[str], Any], env: Mapping[str, str], key: str, default: Any) -> Any:
+    """Read an environment variable with a single lookup and coerce it; unset or empty yields default."""
+    value = env.get(key)
+    if not value:
+        return default
+    if cast is bool:
+        return value.lower() == "true"
+    return cast(value)
+
+
 @dataclass
 class STTConfig:
     """Configuration for STT processing pipeline."""
@@ -15,12 +34,17 @@ class STTConfig:
     # Model settings
     whisper_model: str = "large-v3"
     whisper_device: str = "auto"  # auto, cpu, cuda
-    compute_type: str = "float16"  # float16, int8, float32
+    compute_type: str = "auto"  # auto, int8, int8_float16, float16, bfloat16, float32
+    backend: str = "whisperx"  # whisperx, whisper_blaze (FP8 kernels, Hopper GPUs only)
     
     # Audio processing
     vad_onset: float = 0.5
     vad_offset: float = 0.363
     chunk_length: int = 30
+    # Seconds; long audio is split so diarization overlaps ASR. Opt-in (0 disables): speakers
+    # silent in a chunk overlap cannot be matched across chunks and get new labels
+    pipeline_chunk_length: int = 0
+    pipeline_chunk_overlap: int = 5  # seconds shared by consecutive pipeline chunks
     
     # Diarization settings
     min_speakers: Optional[int] = None
@@ -29,16 +53,20 @@ class STTConfig:
     
     # Performance settings
     batch_size: int = 16
+    batch_max_wait_ms: int = 10  # window for coalescing chunks across concurrent requests
     num_workers: int = 0
     use_gpu: bool = True
     gpu_memory_limit: Optional[float] = None  # GB
+    preload_models: bool = True  # load models in the background at processor init
+    keep_models_loaded: bool = True  # keep models and cached GPU memory resident between files
+    use_tensorrt: bool = False  # compile the alignment model with TensorRT (CUDA only)
+    model_cache_dir: str = "~/.cache/stt_processor"  # compiled TensorRT engines
     
     # Output settings
     language: str = "pt"
     task: str = "transcribe"  # transcribe, translate
     
     # File handling
-    supported_formats: tuple = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".mp4", ".avi", ".mov")
     max_file_size_mb: int = 500
     temp_dir: str = "/tmp/stt_processing"
     
@@ -46,29 +74,43 @@ class STTConfig:
     log_level: str = "INFO"
     structured_logging: bool = True
     
+    @property
+    def supported_formats(self) -> frozenset:
+        """Lowercase audio file suffixes accepted by the pipeline."""
+        return _SUPPORTED_FORMATS
+    
     @classmethod
     def from_env(cls) -> "STTConfig":
         """Create configuration from environment variables."""
+        env = os.environ
         return cls(
-            whisper_model=os.getenv("WHISPER_MODEL", "large-v3"),
-            whisper_device=os.getenv("WHISPER_DEVICE", "auto"),
-            compute_type=os.getenv("COMPUTE_TYPE", "float16"),
-            vad_onset=float(os.getenv("VAD_ONSET", "0.5")),
-            vad_offset=float(os.getenv("VAD_OFFSET", "0.363")),
-            chunk_length=int(os.getenv("CHUNK_LENGTH", "30")),
-            min_speakers=int(os.getenv("MIN_SPEAKERS")) if os.getenv("MIN_SPEAKERS") else None,
-            max_speakers=int(os.getenv("MAX_SPEAKERS")) if os.getenv("MAX_SPEAKERS") else None,
-            num_speakers=int(os.getenv("NUM_SPEAKERS")) if os.getenv("NUM_SPEAKERS") else None,
-            batch_size=int(os.getenv("BATCH_SIZE", "16")),
-            num_workers=int(os.getenv("NUM_WORKERS", "0")),
-            use_gpu=os.getenv("USE_GPU", "true").lower() == "true",
-            gpu_memory_limit=float(os.getenv("GPU_MEMORY_LIMIT")) if os.getenv("GPU_MEMORY_LIMIT") else None,
-            language=os.getenv("LANGUAGE", "pt"),
-            task=os.getenv("TASK", "transcribe"),
-            max_file_size_mb=int(os.getenv("MAX_FILE_SIZE_MB", "500")),
-            temp_dir=os.getenv("TEMP_DIR", "/tmp/stt_processing"),
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
-            structured_logging=os.getenv("STRUCTURED_LOGGING", "true").lower() == "true"
+            whisper_model=env.get("WHISPER_MODEL", "large-v3"),
+            whisper_device=env.get("WHISPER_DEVICE", "auto"),
+            compute_type=env.get("COMPUTE_TYPE", "auto"),
+            backend=env.get("STT_BACKEND", "whisperx"),
+            vad_onset=_env_to(float, env, "VAD_ONSET", 0.5),
+            vad_offset=_env_to(float, env, "VAD_OFFSET", 0.363),
+            chunk_length=_env_to(int, env, "CHUNK_LENGTH", 30),
+            pipeline_chunk_length=_env_to(int, env, "PIPELINE_CHUNK_LENGTH", 0),
+            pipeline_chunk_overlap=_env_to(int, env, "PIPELINE_CHUNK_OVERLAP", 5),
+            min_speakers=_env_to(int, env, "MIN_SPEAKERS", None),
+            max_speakers=_env_to(int, env, "MAX_SPEAKERS", None),
+            num_speakers=_env_to(int, env, "NUM_SPEAKERS", None),
+            batch_size=_env_to(int, env, "BATCH_SIZE", 16),
+            batch_max_wait_ms=_env_to(int, env, "BATCH_MAX_WAIT_MS", 10),
+            num_workers=_env_to(int, env, "NUM_WORKERS", 0),
+            use_gpu=_env_to(bool, env, "USE_GPU", True),
+            gpu_memory_limit=_env_to(float, env, "GPU_MEMORY_LIMIT", None),
+            preload_models=_env_to(bool, env, "PRELOAD_MODELS", True),
+            keep_models_loaded=_env_to(bool, env, "KEEP_MODELS_LOADED", True),
+            use_tensorrt=_env_to(bool, env, "USE_TENSORRT", False),
+            model_cache_dir=env.get("MODEL_CACHE_DIR", "~/.cache/stt_processor"),
+            language=env.get("LANGUAGE", "pt"),
+            task=env.get("TASK", "transcribe"),
+            max_file_size_mb=_env_to(int, env, "MAX_FILE_SIZE_MB", 500),
+            temp_dir=env.get("TEMP_DIR", "/tmp/stt_processing"),
+            log_level=env.get("LOG_LEVEL", "INFO"),
+            structured_logging=_env_to(bool, env, "STRUCTURED_LOGGING", True)
         )
     
     def get_device(self) -> str:
@@ -81,20 +123,32 @@ class STTConfig:
                 return "cpu"
         return self.whisper_device
     
+    def get_compute_type(self) -> str:
+        """Determine the CTranslate2 compute type for the selected device."""
+        if self.compute_type == "auto":
+            return "int8_float16" if self.get_device() == "cuda" else "int8"
+        return self.compute_type
+    
     def validate(self) -> None:
         """Validate configuration parameters."""
-        if self.whisper_model not in ["tiny", "base", "small", "medium", "large", "large-v2", "large-v3"]:
+        if self.whisper_model not in _ALLOWED_MODELS:
             raise ValueError(f"Invalid whisper_model: {self.whisper_model}")
         
-        if self.compute_type not in ["float16", "int8", "float32"]:
+        if self.compute_type not in _ALLOWED_COMPUTE_TYPES:
             raise ValueError(f"Invalid compute_type: {self.compute_type}")
         
-        if self.language not in ["pt", "en", "es", "auto"]:
+        if self.backend not in _ALLOWED_BACKENDS:
+            raise ValueError(f"Invalid backend: {self.backend}")
+        
+        if self.language not in _ALLOWED_LANGUAGES:
             raise ValueError(f"Invalid language: {self.language}")
         
-        if self.task not in ["transcribe", "translate"]:
+        if self.task not in _ALLOWED_TASKS:
             raise ValueError(f"Invalid task: {self.task}")
         
+        if self.pipeline_chunk_length and self.pipeline_chunk_overlap >= self.pipeline_chunk_length:
+            raise ValueError("pipeline_chunk_overlap must be smaller than pipeline_chunk_length")
+        
         if self.min_speakers and self.max_speakers:
             if self.min_speakers > self.max_speakers:
                 raise ValueError("min_speakers cannot be greater than max_speakers")
@@ -108,21 +162,30 @@ class STTConfig:
             "whisper_model": self.whisper_model,
             "whisper_device": self.whisper_device,
             "compute_type": self.compute_type,
+            "backend": self.backend,
             "vad_onset": self.vad_onset,
             "vad_offset": self.vad_offset,
             "chunk_length": self.chunk_length,
+            "pipeline_chunk_length": self.pipeline_chunk_length,
+            "pipeline_chunk_overlap": self.pipeline_chunk_overlap,
             "min_speakers": self.min_speakers,
             "max_speakers": self.max_speakers,
             "num_speakers": self.num_speakers,
             "batch_size": self.batch_size,
+            "batch_max_wait_ms": self.batch_max_wait_ms,
             "num_workers": self.num_workers,
             "use_gpu": self.use_gpu,
             "gpu_memory_limit": self.gpu_memory_limit,
+            "preload_models": self.preload_models,
+            "keep_models_loaded": self.keep_models_loaded,
+            "use_tensorrt": self.use_tensorrt,
+            "model_cache_dir": self.model_cache_dir,
             "language": self.language,
             "task": self.task,
             "max_file_size_mb": self.max_file_size_mb,
             "temp_dir": self.temp_dir,
             "log_level": self.log_level,
             "structured_logging": self.structured_logging,
-            "actual_device": self.get_device()
+            "actual_device": self.get_device(),
+            "actual_compute_type": self.get_compute_type()
         }
\ No newline at end of file
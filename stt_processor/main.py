@@ -8,22 +8,27 @@ healthcare consultations with advanced speaker diarization.
 
 import asyncio
 import gc
+import json
 import logging
+import os
+import subprocess
+import tempfile
+import threading
 import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-import librosa
-import numpy as np
 import soundfile as sf
 import torch
-import whisper
+import torchaudio
 import whisperx
 
 from .config import STTConfig
-from .models import ProcessingJob, SpeakerSegment, TranscriptionResult
+from .models import ProcessingJob, SpeakerSegment, TranscriptionResult, Word
+from .trt_cache import compile_align_model, load_cached_align_model
 
 
 class STTProcessor:
@@ -47,14 +52,35 @@ class STTProcessor:
         self._setup_logging()
         
         # Model storage
-        self.whisper_model = None
         self.whisperx_model = None
         self.align_model = None
+        self.align_metadata: Optional[Dict] = None
         self.diarize_model = None
+        self._model_lock = threading.Lock()
+        self._active_jobs = 0
+        
+        # Cross-request chunk batching (created lazily on the running event loop)
+        self._chunk_queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        self._batcher_loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Device configuration
         self.device = self.config.get_device()
-        self.compute_type = self.config.compute_type
+        self.compute_type = self.config.get_compute_type()
+        self.backend = self._select_backend()
+        self._apply_gpu_memory_limit()
+        
+        # Executors keep blocking work off the event loop
+        self._create_executors()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Dedicated streams so host->device audio uploads and chunked diarization
+        # overlap with transcription work
+        self._upload_stream = torch.cuda.Stream(device=self.device) if self.device == "cuda" else None
+        self._diar_stream = torch.cuda.Stream(device=self.device) if self.device == "cuda" else None
+        
+        # GPU resampling kernels, keyed by (source_rate, target_rate)
+        self._resamplers: Dict[Tuple[int, int], torchaudio.transforms.Resample] = {}
         
         # Performance tracking
         self.processing_stats = {
@@ -64,11 +90,19 @@ class STTProcessor:
             "average_rtf": 0.0  # Real-time factor
         }
         
+        # Start loading models in the background so the first file sees warm models
+        self._load_executor: Optional[ThreadPoolExecutor] = None
+        self._load_future: Optional[Future] = None
+        if self.config.preload_models:
+            self._load_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-model-load")
+            self._load_future = self._load_executor.submit(self._load_all_models_blocking)
+        
         self.logger.info(
             "STT Processor initialized",
             extra={
                 "config": self.config.to_dict(),
                 "device": self.device,
+                "backend": self.backend,
                 "gpu_available": torch.cuda.is_available(),
                 "gpu_count": torch.cuda.device_count() if torch.cuda.is_available() else 0
             }
@@ -79,6 +113,9 @@ class STTProcessor:
         self.logger = logging.getLogger(__name__)
         self.logger.setLevel(getattr(logging, self.config.log_level))
         
+        # Resolved once; both the stdlib and structlog loggers filter on config.log_level
+        self._debug_enabled = getattr(logging, self.config.log_level) <= logging.DEBUG
+        
         if not self.logger.handlers:
             handler = logging.StreamHandler()
             if self.config.structured_logging:
@@ -103,66 +140,109 @@ class STTProcessor:
                 handler.setFormatter(formatter)
                 self.logger.addHandler(handler)
     
+    def _create_executors(self):
+        """Create the GPU stage executor (single worker, serialized on the device) and CPU decode pool."""
+        self._gpu_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-gpu")
+        self._diar_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-diar")
+        self._cpu_executor = ThreadPoolExecutor(
+            max_workers=self.config.num_workers or None, thread_name_prefix="stt-cpu"
+        )
+    
     @contextmanager
     def _gpu_memory_manager(self):
-        """Context manager for GPU memory optimization."""
+        """
+        Context manager for GPU memory tracking.
+        
+        The CUDA caching allocator is kept warm between stages; cached blocks are
+        only released by _end_of_job_cleanup, and only when models are not kept loaded.
+        """
+        # memory_allocated() takes the allocator lock, so only query it when debug logs are emitted
+        track_memory = self._debug_enabled and torch.cuda.is_available()
         try:
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+            if track_memory:
                 initial_memory = torch.cuda.memory_allocated()
                 self.logger.debug(f"GPU memory before operation: {initial_memory / 1024**3:.2f} GB")
             
             yield
             
         finally:
+            if track_memory:
+                final_memory = torch.cuda.memory_allocated()
+                self.logger.debug(f"GPU memory after operation: {final_memory / 1024**3:.2f} GB")
+    
+    def _end_of_job_cleanup(self):
+        """
+        Collect garbage once a job has finished.
+        
+        With keep_models_loaded the models and the allocator's cached blocks stay
+        resident for the next file; otherwise both are released once no other
+        job is in flight.
+        """
+        if not self.config.keep_models_loaded and self._active_jobs == 0:
+            self._unload_models()
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
-                gc.collect()
-                final_memory = torch.cuda.memory_allocated()
-                self.logger.debug(f"GPU memory after cleanup: {final_memory / 1024**3:.2f} GB")
+        gc.collect()
     
-    def _load_whisper_model(self):
-        """Load Whisper model with optimization."""
-        if self.whisper_model is None:
-            self.logger.info(f"Loading Whisper model: {self.config.whisper_model}")
-            start_time = time.time()
-            
-            with self._gpu_memory_manager():
-                self.whisper_model = whisper.load_model(
-                    self.config.whisper_model,
-                    device=self.device
-                )
-            
-            load_time = time.time() - start_time
-            self.logger.info(
-                f"Whisper model loaded successfully",
-                extra={
-                    "model": self.config.whisper_model,
-                    "device": self.device,
-                    "load_time": load_time
-                }
+    def _apply_gpu_memory_limit(self):
+        """Cap this process's share of GPU memory to config.gpu_memory_limit (GB)."""
+        if self.device != "cuda" or not self.config.gpu_memory_limit:
+            return
+        
+        total_gb = torch.cuda.get_device_properties(torch.cuda.current_device()).total_memory / 1024**3
+        fraction = min(1.0, self.config.gpu_memory_limit / total_gb)
+        torch.cuda.set_per_process_memory_fraction(fraction)
+        self.logger.info(
+            "GPU memory limit applied",
+            extra={"limit_gb": self.config.gpu_memory_limit, "fraction": fraction}
+        )
+    
+    def _select_backend(self) -> str:
+        """Resolve the transcription backend, falling back to whisperx when unsupported."""
+        if self.config.backend == "whisper_blaze":
+            # FP8 WGMMA / FlashAttention-3 kernels require Hopper (sm_90) or newer
+            if self.device == "cuda" and torch.cuda.get_device_capability()[0] >= 9:
+                return "whisper_blaze"
+            self.logger.warning(
+                "whisper_blaze backend requires a Hopper GPU, falling back to whisperx",
+                extra={"device": self.device}
             )
+        return "whisperx"
     
     def _load_whisperx_models(self):
         """Load WhisperX models for diarization and alignment."""
-        if self.whisperx_model is None:
-            self.logger.info("Loading WhisperX models")
-            start_time = time.time()
-            
-            with self._gpu_memory_manager():
-                # Load WhisperX model
-                self.whisperx_model = whisperx.load_model(
-                    self.config.whisper_model,
-                    self.device,
-                    compute_type=self.compute_type,
-                    language=self.config.language
-                )
+        with self._model_lock:
+            if self.whisperx_model is None:
+                self.logger.info("Loading WhisperX models")
+                start_time = time.time()
+                
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+                
+                if self.backend == "whisper_blaze":
+                    # Load Hopper-native FP8 model
+                    from whisper_blaze import WhisperBlaze
+                    from whisper_blaze.precision import mixed_fp8
+                    self.whisperx_model = WhisperBlaze.from_pretrained(
+                        f"openai/whisper-{self.config.whisper_model}",
+                        precision=mixed_fp8()
+                    )
+                else:
+                    # Load WhisperX model (faster-whisper / CTranslate2 backend)
+                    self.whisperx_model = whisperx.load_model(
+                        self.config.whisper_model,
+                        self.device,
+                        compute_type=self.compute_type,
+                        language=self.config.language,
+                        task=self.config.task,
+                        vad_options={
+                            "vad_onset": self.config.vad_onset,
+                            "vad_offset": self.config.vad_offset
+                        }
+                    )
                 
                 # Load alignment model
-                self.align_model, metadata = whisperx.load_align_model(
-                    language_code=self.config.language,
-                    device=self.device
-                )
+                self.align_model, self.align_metadata = self._load_align_model()
                 
                 # Load diarization model (using pyannote)
                 from pyannote.audio import Pipeline
@@ -170,14 +250,73 @@ class STTProcessor:
                     "pyannote/speaker-diarization-3.1",
                     use_auth_token=None  # Add HuggingFace token if needed
                 ).to(torch.device(self.device))
-            
-            load_time = time.time() - start_time
-            self.logger.info(
-                f"WhisperX models loaded successfully",
-                extra={"load_time": load_time}
+                
+                load_time = time.time() - start_time
+                self.logger.info(
+                    f"WhisperX models loaded successfully",
+                    extra={
+                        "model": self.config.whisper_model,
+                        "device": self.device,
+                        "compute_type": self.compute_type,
+                        "backend": self.backend,
+                        "load_time": load_time
+                    }
+                )
+    
+    def _load_all_models_blocking(self):
+        """Load every model required by the pipeline (runs on the preload thread)."""
+        self._load_whisperx_models()
+    
+    def _unload_models(self):
+        """Drop references to all models so their memory can be reclaimed."""
+        with self._model_lock:
+            self.whisperx_model = None
+            self.align_model = None
+            self.align_metadata = None
+            self.diarize_model = None
+    
+    def _load_align_model(self) -> Tuple[torch.nn.Module, Dict]:
+        """Load the alignment model, using the TensorRT engine cache when enabled on CUDA."""
+        use_tensorrt = self.config.use_tensorrt and self.device == "cuda"
+        cache_dir = Path(self.config.model_cache_dir).expanduser()
+        model_key = f"align-{self.config.language}"
+        
+        if use_tensorrt:
+            cached = load_cached_align_model(cache_dir, model_key, self.compute_type)
+            if cached is not None:
+                return cached
+        
+        align_model, metadata = whisperx.load_align_model(
+            language_code=self.config.language,
+            device=self.device
+        )
+        
+        if use_tensorrt:
+            align_model = compile_align_model(
+                align_model,
+                metadata,
+                cache_dir,
+                model_key,
+                self.compute_type,
+                max_seconds=2 * self.config.chunk_length
             )
+        else:
+            align_model = self._quantize_align_model(align_model)
+        
+        return align_model, metadata
+    
+    def _quantize_align_model(self, align_model: torch.nn.Module) -> torch.nn.Module:
+        """Apply INT8 dynamic quantization to the alignment model's Linear layers on CPU."""
+        if self.compute_type != "int8" or self.device != "cpu":
+            return align_model
+        
+        quantized = torch.ao.quantization.quantize_dynamic(
+            align_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        self.logger.info("Alignment model quantized to INT8", extra={"device": self.device})
+        return quantized
     
-    def _preprocess_audio(self, audio_path: Union[str, Path]) -> Tuple[np.ndarray, int]:
+    def _preprocess_audio(self, audio_path: Union[str, Path]) -> Tuple[torch.Tensor, int]:
         """
         Preprocess audio file for optimal transcription.
         
@@ -185,40 +324,48 @@ class STTProcessor:
             audio_path: Path to audio file
             
         Returns:
-            Tuple of (audio_data, sample_rate)
+            Tuple of (audio_tensor, sample_rate); the mono waveform lives on self.device
         """
-        audio_path = Path(audio_path)
+        path_str = os.fspath(audio_path)
         
-        if not audio_path.exists():
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        # Single stat() for existence and size
+        try:
+            file_stat = os.stat(path_str)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Audio file not found: {path_str}") from None
         
-        if audio_path.suffix.lower() not in self.config.supported_formats:
-            raise ValueError(f"Unsupported audio format: {audio_path.suffix}")
+        suffix = os.path.splitext(path_str)[1].lower()
+        if suffix not in self.config.supported_formats:
+            raise ValueError(f"Unsupported audio format: {suffix}")
         
         # Check file size
-        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+        file_size_mb = file_stat.st_size / (1024 * 1024)
         if file_size_mb > self.config.max_file_size_mb:
             raise ValueError(f"File too large: {file_size_mb:.1f}MB > {self.config.max_file_size_mb}MB")
         
         self.logger.info(
             f"Preprocessing audio file",
             extra={
-                "file_path": str(audio_path),
+                "file_path": path_str,
                 "file_size_mb": file_size_mb
             }
         )
         
-        # Load audio with librosa for robust format support
-        audio_data, sample_rate = librosa.load(
-            str(audio_path),
-            sr=16000,  # WhisperX expects 16kHz
-            mono=True
-        )
+        # Stream-decode to mono PCM, then convert, resample and normalize on device
+        sample_rate = 16000  # WhisperX expects 16kHz
+        pcm, decoded_rate = self._decode_audio(path_str, sample_rate)
         
-        # Normalize audio
-        audio_data = librosa.util.normalize(audio_data)
+        if self._upload_stream is not None:
+            # The PCM buffer is pinned, so the copy is a true async memcpy on the upload
+            # stream; _run_pipeline orders the compute stream after it
+            with torch.cuda.stream(self._upload_stream):
+                audio_tensor = self._normalize_pcm(
+                    pcm.to(self.device, non_blocking=True), decoded_rate, sample_rate
+                )
+        else:
+            audio_tensor = self._normalize_pcm(pcm, decoded_rate, sample_rate)
         
-        duration = len(audio_data) / sample_rate
+        duration = audio_tensor.shape[0] / sample_rate
         self.logger.info(
             f"Audio preprocessed",
             extra={
@@ -228,20 +375,147 @@ class STTProcessor:
             }
         )
         
-        return audio_data, sample_rate
+        return audio_tensor, sample_rate
     
-    def _transcribe_with_whisperx(self, audio_data: np.ndarray) -> Dict:
+    def load_audio(self, audio_path: Union[str, Path]) -> Tuple[torch.Tensor, int]:
+        """
+        Decode an audio file ahead of processing.
+        
+        Callers can decode the next file on a CPU thread while the current one is
+        on the GPU, then pass the waveform to process_audio.
+        
+        Args:
+            audio_path: Path to audio file
+            
+        Returns:
+            Tuple of (audio_tensor, sample_rate), as produced for process_file
+        """
+        return self._preprocess_audio(audio_path)
+    
+    def _probe_audio(self, path_str: str) -> Tuple[Optional[float], Optional[int]]:
+        """Read the container duration and first audio stream's sample rate with ffprobe."""
+        try:
+            output = subprocess.run(
+                [
+                    "ffprobe", "-v", "error",
+                    "-select_streams", "a:0",
+                    "-show_entries", "format=duration:stream=sample_rate",
+                    "-of", "json",
+                    path_str
+                ],
+                capture_output=True,
+                text=True,
+                check=True
+            ).stdout
+            probe = json.loads(output)
+        except (OSError, subprocess.CalledProcessError, ValueError):
+            # Probe is only a size hint; decoding grows the buffer as needed
+            return None, None
+        
+        duration = probe.get("format", {}).get("duration")
+        streams = probe.get("streams") or [{}]
+        source_rate = streams[0].get("sample_rate")
+        return (
+            float(duration) if duration else None,
+            int(source_rate) if source_rate else None
+        )
+    
+    def _decode_audio(self, path_str: str, sample_rate: int) -> Tuple[torch.Tensor, int]:
+        """
+        Stream-decode audio with ffmpeg into a preallocated 16-bit PCM buffer.
+        
+        ffmpeg downmixes while decoding. On CPU it also resamples to sample_rate; on
+        CUDA the source rate is kept and resampling is left to the GPU. The buffer
+        is sized from the ffprobe duration and pinned when running on CUDA.
+        
+        Args:
+            path_str: Path to audio file
+            sample_rate: Target sample rate
+            
+        Returns:
+            Tuple of (1-D int16 tensor with the decoded mono samples, its sample rate)
+        """
+        duration, source_rate = self._probe_audio(path_str)
+        decode_rate = source_rate if self.device == "cuda" and source_rate else sample_rate
+        # One second of slack absorbs container duration rounding
+        capacity = int((duration + 1) * decode_rate) if duration else 60 * decode_rate
+        pin_memory = self.device == "cuda"
+        buffer = torch.empty(capacity, dtype=torch.int16, pin_memory=pin_memory)
+        raw = memoryview(buffer.numpy()).cast("B")
+        
+        # stderr goes to a file, not a pipe: a corrupt input can log more than the pipe
+        # buffer holds, which would block ffmpeg while we block reading stdout
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                [
+                    "ffmpeg", "-nostdin", "-loglevel", "error",
+                    "-i", path_str,
+                    "-f", "s16le", "-ac", "1", "-ar", str(decode_rate),
+                    "-"
+                ],
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                bufsize=1 << 20
+            )
+            
+            filled = 0
+            with process:
+                while True:
+                    if filled == len(raw):
+                        # Duration probe was short; grow the buffer
+                        grown = torch.empty(buffer.shape[0] * 2, dtype=torch.int16, pin_memory=pin_memory)
+                        grown[:buffer.shape[0]].copy_(buffer)
+                        buffer = grown
+                        raw = memoryview(buffer.numpy()).cast("B")
+                    
+                    read = process.stdout.readinto(raw[filled:filled + (1 << 20)])
+                    if not read:
+                        break
+                    filled += read
+            
+            # Popen.__exit__ waited for ffmpeg, so returncode is set
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode {path_str}: {stderr.strip()}")
+        if filled < 2:
+            raise ValueError(f"No audio decoded from {path_str}")
+        
+        return buffer[:filled // 2], decode_rate
+    
+    def _normalize_pcm(self, pcm: torch.Tensor, source_rate: int, target_rate: int) -> torch.Tensor:
+        """Convert int16 PCM to float32 in [-1, 1], resample and peak-normalize on the tensor's device."""
+        audio_tensor = pcm.float().div_(32768.0)
+        
+        if source_rate != target_rate:
+            audio_tensor = self._get_resampler(source_rate, target_rate)(audio_tensor)
+        
+        # Peak-normalize audio
+        return audio_tensor / audio_tensor.abs().max().clamp_min(1e-8)
+    
+    def _get_resampler(self, source_rate: int, target_rate: int) -> torchaudio.transforms.Resample:
+        """Return a cached Resample module on self.device, building its kernel once per rate pair."""
+        key = (source_rate, target_rate)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = torchaudio.transforms.Resample(source_rate, target_rate).to(self.device)
+            self._resamplers[key] = resampler
+        return resampler
+    
+    async def _transcribe_with_whisperx(self, audio_tensor: torch.Tensor) -> Dict:
         """Transcribe audio using WhisperX."""
         self.logger.info("Starting WhisperX transcription")
         start_time = time.time()
         
-        with self._gpu_memory_manager():
-            # Transcribe
-            result = self.whisperx_model.transcribe(
-                audio_data,
-                batch_size=self.config.batch_size,
-                language=self.config.language,
-                task=self.config.task
+        if self._supports_chunk_batching():
+            # Chunks are batched with those of concurrent requests
+            pending = await self._enqueue_chunks(audio_tensor)
+            result = await self._collect_segments(pending)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._gpu_executor, self._transcribe_file, audio_tensor
             )
         
         transcription_time = time.time() - start_time
@@ -255,20 +529,182 @@ class STTProcessor:
         
         return result
     
-    def _align_transcription(self, transcription_result: Dict, audio_data: np.ndarray) -> Dict:
+    def _transcribe_file(self, audio_tensor: torch.Tensor) -> Dict:
+        """Transcribe a whole file with the backend's own transcribe call."""
+        if self.backend == "whisper_blaze":
+            return self._normalize_blaze_result(
+                self.whisperx_model.transcribe(
+                    audio_tensor,
+                    language=self.config.language,
+                    task=self.config.task
+                )
+            )
+        
+        return self.whisperx_model.transcribe(
+            audio_tensor.cpu().numpy(),
+            batch_size=self.config.batch_size,
+            language=self.config.language,
+            task=self.config.task
+        )
+    
+    def _supports_chunk_batching(self) -> bool:
+        """Cross-request batching needs the whisperx pipeline with a fixed language tokenizer."""
+        return (
+            self.backend == "whisperx"
+            and getattr(self.whisperx_model, "tokenizer", None) is not None
+        )
+    
+    def _vad_chunks(self, audio_tensor: torch.Tensor) -> List[Dict]:
+        """Run VAD and merge speech regions into chunks of at most chunk_length seconds."""
+        from whisperx.vad import merge_chunks
+        
+        vad_segments = self.whisperx_model.vad_model(
+            {"waveform": audio_tensor.unsqueeze(0), "sample_rate": 16000}
+        )
+        return merge_chunks(
+            vad_segments,
+            self.config.chunk_length,
+            onset=self.config.vad_onset,
+            offset=self.config.vad_offset
+        )
+    
+    async def _enqueue_chunks(self, audio_tensor: torch.Tensor) -> List[Tuple[Dict, asyncio.Future]]:
+        """
+        Split audio into VAD chunks and queue them for batched decoding.
+        
+        Args:
+            audio_tensor: 16kHz mono waveform on self.device
+            
+        Returns:
+            List of (vad_chunk, future) pairs; each future resolves to the chunk text
+        """
+        self._ensure_chunk_batcher()
+        loop = asyncio.get_running_loop()
+        
+        vad_chunks = await loop.run_in_executor(self._gpu_executor, self._vad_chunks, audio_tensor)
+        
+        pending = []
+        for chunk in vad_chunks:
+            chunk_audio = audio_tensor[int(chunk["start"] * 16000):int(chunk["end"] * 16000)]
+            future = loop.create_future()
+            self._chunk_queue.put_nowait((chunk_audio, future))
+            pending.append((chunk, future))
+        
+        return pending
+    
+    async def _collect_segments(self, pending: List[Tuple[Dict, asyncio.Future]]) -> Dict:
+        """Await batched chunk results and rebuild the whisperx segment schema."""
+        texts = await asyncio.gather(*(future for _, future in pending))
+        
+        segments = [
+            {
+                "text": text,
+                "start": round(chunk["start"], 3),
+                "end": round(chunk["end"], 3)
+            }
+            for (chunk, _), text in zip(pending, texts)
+        ]
+        return {"segments": segments, "language": self.config.language}
+    
+    def _ensure_chunk_batcher(self):
+        """Start the chunk coalescer on the current event loop if not running."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._batcher_task is None
+            or self._batcher_task.done()
+            or self._batcher_loop is not loop
+        ):
+            self._chunk_queue = asyncio.Queue()
+            self._batcher_loop = loop
+            self._batcher_task = loop.create_task(self._coalesce_chunks())
+    
+    async def _coalesce_chunks(self):
+        """Collect queued chunks into batches and decode each batch in one generate call."""
+        loop = asyncio.get_running_loop()
+        max_wait = self.config.batch_max_wait_ms / 1000
+        
+        while True:
+            batch = [await self._chunk_queue.get()]
+            deadline = loop.time() + max_wait
+            
+            while len(batch) < self.config.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._chunk_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                outputs = await loop.run_in_executor(
+                    self._gpu_executor, self._decode_chunk_batch, [chunk_audio for chunk_audio, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            self.logger.debug(f"Decoded chunk batch of size {len(batch)}")
+            
+            for (_, future), text in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(text)
+    
+    def _decode_chunk_batch(self, chunks: List[torch.Tensor]) -> List[str]:
+        """Decode a batch of audio chunks in one pipeline call and return their texts."""
+        outputs = self.whisperx_model(
+            [{"inputs": chunk_audio} for chunk_audio in chunks],
+            batch_size=len(chunks)
+        )
+        
+        texts = []
+        for output in outputs:
+            text = output["text"]
+            if isinstance(text, list):
+                text = text[0]
+            texts.append(text)
+        return texts
+    
+    def _normalize_blaze_result(self, blaze_result: Dict) -> Dict:
+        """Convert whisper_blaze output to the segment schema expected by whisperx.align."""
+        segments = []
+        for segment in blaze_result.get("segments", []):
+            normalized = {
+                "start": float(segment["start"]),
+                "end": float(segment["end"]),
+                "text": segment["text"]
+            }
+            if segment.get("words"):
+                normalized["words"] = segment["words"]
+            segments.append(normalized)
+        return {
+            "segments": segments,
+            "language": blaze_result.get("language", self.config.language)
+        }
+    
+    def _has_word_timestamps(self, transcription_result: Dict) -> bool:
+        """Check whether every segment already carries timed words."""
+        segments = transcription_result.get("segments", [])
+        return bool(segments) and all(
+            segment.get("words") and all("start" in word for word in segment["words"])
+            for segment in segments
+        )
+    
+    def _align_transcription(self, transcription_result: Dict, audio_tensor: torch.Tensor) -> Dict:
         """Align transcription with audio for word-level timestamps."""
         self.logger.info("Starting transcript alignment")
         start_time = time.time()
         
-        with self._gpu_memory_manager():
-            aligned_result = whisperx.align(
-                transcription_result["segments"],
-                self.align_model,
-                whisperx.utils.LANGUAGES[self.config.language],
-                audio_data,
-                self.device,
-                return_char_alignments=False
-            )
+        aligned_result = whisperx.align(
+            transcription_result["segments"],
+            self.align_model,
+            self.align_metadata,
+            audio_tensor,
+            self.device,
+            return_char_alignments=False
+        )
         
         alignment_time = time.time() - start_time
         self.logger.info(
@@ -278,25 +714,23 @@ class STTProcessor:
         
         return aligned_result
     
-    def _perform_diarization(self, audio_data: np.ndarray, aligned_result: Dict) -> Dict:
+    def _perform_diarization(self, audio_tensor: torch.Tensor, aligned_result: Dict) -> Dict:
         """Perform speaker diarization."""
         self.logger.info("Starting speaker diarization")
         start_time = time.time()
         
-        with self._gpu_memory_manager():
-            # Perform diarization
-            audio_tensor = torch.tensor(audio_data).unsqueeze(0)
-            diarization_result = self.diarize_model(
-                {"waveform": audio_tensor, "sample_rate": 16000},
-                min_speakers=self.config.min_speakers,
-                max_speakers=self.config.max_speakers,
-                num_speakers=self.config.num_speakers
-            )
-            
-            # Assign speakers to segments
-            diarized_result = whisperx.assign_word_speakers(
-                diarization_result, aligned_result
-            )
+        # Perform diarization
+        diarization_result = self.diarize_model(
+            {"waveform": audio_tensor.unsqueeze(0), "sample_rate": 16000},
+            min_speakers=self.config.min_speakers,
+            max_speakers=self.config.max_speakers,
+            num_speakers=self.config.num_speakers
+        )
+        
+        # Assign speakers to segments
+        diarized_result = whisperx.assign_word_speakers(
+            diarization_result, aligned_result
+        )
         
         diarization_time = time.time() - start_time
         
@@ -317,10 +751,307 @@ class STTProcessor:
         
         return diarized_result
     
+    async def _run_pipeline(self, audio_tensor: torch.Tensor) -> Dict:
+        """
+        Run transcription, alignment and diarization in a single GPU residency pass.
+        
+        The waveform stays on device for all three stages and the CUDA cache is
+        only released once the last stage has finished.
+        
+        Args:
+            audio_tensor: 16kHz mono waveform on self.device
+            
+        Returns:
+            Diarized whisperx result with word-level speaker assignments
+        """
+        if self._upload_stream is not None:
+            # Wait (on device, not host) for the async upload before consuming the waveform
+            compute_stream = torch.cuda.current_stream()
+            compute_stream.wait_stream(self._upload_stream)
+            audio_tensor.record_stream(compute_stream)
+        
+        loop = asyncio.get_running_loop()
+        chunk_length = self.config.pipeline_chunk_length
+        
+        with self._gpu_memory_manager():
+            if chunk_length and audio_tensor.shape[0] > chunk_length * 16000:
+                diarized_result = await self._run_chunked_pipeline(audio_tensor)
+            else:
+                aligned_result = await self._transcribe_and_align(audio_tensor)
+                diarized_result = await loop.run_in_executor(
+                    self._gpu_executor, self._perform_diarization, audio_tensor, aligned_result
+                )
+        
+        return diarized_result
+    
+    async def _transcribe_and_align(self, audio_tensor: torch.Tensor) -> Dict:
+        """Transcribe audio and add word-level timestamps when the decoder did not provide them."""
+        transcription_result = await self._transcribe_with_whisperx(audio_tensor)
+        if self._has_word_timestamps(transcription_result):
+            # Decoder already produced word timings, no separate alignment pass
+            return transcription_result
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._gpu_executor, self._align_transcription, transcription_result, audio_tensor
+        )
+    
+    def _chunk_iter(
+        self, audio_tensor: torch.Tensor, chunk_s: int = 600, overlap_s: int = 5
+    ) -> Iterator[Tuple[float, torch.Tensor]]:
+        """
+        Split audio into consecutive windows for chunked processing.
+        
+        Args:
+            audio_tensor: 16kHz mono waveform
+            chunk_s: Window length in seconds
+            overlap_s: Seconds each window extends into the next one
+            
+        Yields:
+            Tuples of (start_offset_seconds, chunk_tensor)
+        """
+        sample_rate = 16000
+        step = chunk_s * sample_rate
+        overlap = overlap_s * sample_rate
+        total = audio_tensor.shape[0]
+        
+        for start in range(0, total, step):
+            if start > 0 and total - start <= overlap:
+                # Tail already covered by the previous window's overlap
+                break
+            yield start / sample_rate, audio_tensor[start:min(start + step + overlap, total)]
+    
+    async def _run_chunked_pipeline(self, audio_tensor: torch.Tensor) -> Dict:
+        """
+        Process long audio in chunks, diarizing each chunk while the next is transcribed.
+        
+        Diarization runs on its own executor (and CUDA stream), so it overlaps with
+        transcription and alignment on the GPU executor. Chunk results are shifted to
+        global time and stitched with speaker IDs harmonised over the overlap regions.
+        """
+        loop = asyncio.get_running_loop()
+        overlap_s = self.config.pipeline_chunk_overlap
+        start_time = time.time()
+        
+        diarization_futures = []
+        aligned_chunks = []
+        for offset, chunk in self._chunk_iter(audio_tensor, self.config.pipeline_chunk_length, overlap_s):
+            diarization_futures.append(
+                loop.run_in_executor(self._diar_executor, self._diarize_chunk, chunk)
+            )
+            aligned_chunks.append((offset, await self._transcribe_and_align(chunk)))
+        
+        diarizations = await asyncio.gather(*diarization_futures)
+        
+        diarized_chunks = [
+            (offset, whisperx.assign_word_speakers(diarization_result, aligned_result))
+            for (offset, aligned_result), diarization_result in zip(aligned_chunks, diarizations)
+        ]
+        diarized_result = self._stitch_chunks(diarized_chunks, overlap_s)
+        
+        speakers_found = {
+            segment["speaker"] for segment in diarized_result["segments"] if "speaker" in segment
+        }
+        self.logger.info(
+            f"Chunked transcription and diarization completed",
+            extra={
+                "chunks": len(diarized_chunks),
+                "pipeline_time": time.time() - start_time,
+                "speakers_found": len(speakers_found),
+                "speaker_ids": list(speakers_found)
+            }
+        )
+        
+        return diarized_result
+    
+    def _diarize_chunk(self, chunk: torch.Tensor):
+        """Diarize one chunk on the diarization stream; speaker count is only bounded above per chunk."""
+        max_speakers = self.config.num_speakers or self.config.max_speakers
+        
+        if self._diar_stream is None:
+            return self.diarize_model(
+                {"waveform": chunk.unsqueeze(0), "sample_rate": 16000},
+                max_speakers=max_speakers
+            )
+        
+        self._diar_stream.wait_stream(torch.cuda.default_stream(self.device))
+        chunk.record_stream(self._diar_stream)
+        with torch.cuda.stream(self._diar_stream):
+            diarization_result = self.diarize_model(
+                {"waveform": chunk.unsqueeze(0), "sample_rate": 16000},
+                max_speakers=max_speakers
+            )
+        self._diar_stream.synchronize()
+        return diarization_result
+    
+    def _stitch_chunks(self, diarized_chunks: List[Tuple[float, Dict]], overlap_s: float) -> Dict:
+        """
+        Merge per-chunk diarized results into one result in global time.
+        
+        Chunk-local speaker labels are mapped to global IDs by majority vote over the
+        words both chunks transcribed in their overlap. Each overlap is cut at its
+        middle at word level: the previous chunk keeps words starting before the cut
+        and the current chunk those starting at or after it, so a sentence running
+        across the cut is neither lost nor emitted twice.
+        """
+        stitched: List[Dict] = []
+        previous: List[Dict] = []
+        global_speakers = set()
+        
+        for index, (offset, result) in enumerate(diarized_chunks):
+            segments = [self._shift_segment(segment, offset) for segment in result.get("segments", [])]
+            
+            if index == 0:
+                mapping = {}
+            else:
+                mapping = self._match_speakers(previous, segments, offset, offset + overlap_s)
+            
+            for label in sorted({segment["speaker"] for segment in segments if "speaker" in segment}):
+                if label not in mapping:
+                    mapping[label] = label if label not in global_speakers else self._next_speaker_id(global_speakers)
+                global_speakers.add(mapping[label])
+            
+            for segment in segments:
+                self._relabel_segment(segment, mapping)
+            
+            if index == 0:
+                stitched.extend(segments)
+            else:
+                boundary = offset + overlap_s / 2
+                stitched = [
+                    trimmed for trimmed in (
+                        self._cut_segment(segment, boundary, keep_before=True) for segment in stitched
+                    )
+                    if trimmed is not None
+                ]
+                stitched.extend(
+                    trimmed for trimmed in (
+                        self._cut_segment(segment, boundary, keep_before=False) for segment in segments
+                    )
+                    if trimmed is not None
+                )
+            
+            previous = segments
+        
+        return {"segments": stitched, "language": self.config.language}
+    
+    def _cut_segment(self, segment: Dict, boundary: float, keep_before: bool) -> Optional[Dict]:
+        """
+        Keep the words of a segment on one side of a stitching boundary.
+        
+        Words are placed by their start time; untimed words follow the nearest
+        preceding timed word (or the first one, when they lead the segment).
+        Segments without timed words are placed by their own start.
+        
+        Args:
+            segment: Segment in global time
+            boundary: Cut point in seconds
+            keep_before: Keep words starting before the boundary, else at or after it
+            
+        Returns:
+            The segment, a trimmed copy, or None when nothing is kept
+        """
+        if keep_before and segment["end"] <= boundary:
+            return segment
+        if not keep_before and segment["start"] >= boundary:
+            return segment
+        
+        words = segment.get("words", [])
+        sides = [word["start"] < boundary if "start" in word else None for word in words]
+        timed_sides = [side for side in sides if side is not None]
+        if not timed_sides:
+            return segment if (segment["start"] < boundary) == keep_before else None
+        
+        last_side = timed_sides[0]
+        for index, side in enumerate(sides):
+            if side is None:
+                sides[index] = last_side
+            else:
+                last_side = side
+        
+        kept = [word for word, side in zip(words, sides) if side == keep_before]
+        if not kept:
+            return None
+        if len(kept) == len(words):
+            return segment
+        
+        timed = [word for word in kept if "start" in word]
+        trimmed = dict(segment)
+        trimmed["words"] = kept
+        trimmed["text"] = " ".join(word["word"].strip() for word in kept)
+        trimmed["start"] = timed[0]["start"]
+        trimmed["end"] = max(word.get("end", word["start"]) for word in timed)
+        return trimmed
+    
+    def _shift_segment(self, segment: Dict, offset: float) -> Dict:
+        """Return a copy of a segment (and its words) moved from chunk-local to global time."""
+        shifted = dict(segment)
+        shifted["start"] = segment["start"] + offset
+        shifted["end"] = segment["end"] + offset
+        
+        words = []
+        for word in segment.get("words", []):
+            word = dict(word)
+            if "start" in word:
+                word["start"] += offset
+            if "end" in word:
+                word["end"] += offset
+            words.append(word)
+        shifted["words"] = words
+        
+        return shifted
+    
+    def _match_speakers(
+        self, previous: List[Dict], current: List[Dict], overlap_start: float, overlap_end: float
+    ) -> Dict[str, str]:
+        """Map current-chunk labels onto previous-chunk global labels by vote over the overlap."""
+        previous_words = [
+            word
+            for segment in previous
+            for word in segment.get("words", [])
+            if "start" in word and "end" in word and "speaker" in word and word["end"] > overlap_start
+        ]
+        
+        votes: Dict[Tuple[str, str], int] = {}
+        for segment in current:
+            for word in segment.get("words", []):
+                if "start" not in word or "speaker" not in word or word["start"] >= overlap_end:
+                    continue
+                midpoint = (word["start"] + word.get("end", word["start"])) / 2
+                for previous_word in previous_words:
+                    if previous_word["start"] <= midpoint <= previous_word["end"]:
+                        key = (word["speaker"], previous_word["speaker"])
+                        votes[key] = votes.get(key, 0) + 1
+                        break
+        
+        # Greedy one-to-one assignment, strongest agreement first
+        mapping: Dict[str, str] = {}
+        taken = set()
+        for (local_label, global_label), _ in sorted(votes.items(), key=lambda item: -item[1]):
+            if local_label not in mapping and global_label not in taken:
+                mapping[local_label] = global_label
+                taken.add(global_label)
+        
+        return mapping
+    
+    def _relabel_segment(self, segment: Dict, mapping: Dict[str, str]):
+        """Rewrite chunk-local speaker labels of a segment and its words in place."""
+        if "speaker" in segment:
+            segment["speaker"] = mapping.get(segment["speaker"], segment["speaker"])
+        for word in segment.get("words", []):
+            if "speaker" in word:
+                word["speaker"] = mapping.get(word["speaker"], word["speaker"])
+    
+    def _next_speaker_id(self, used: set) -> str:
+        """Return the lowest SPEAKER_XX label not already in use."""
+        index = 0
+        while f"SPEAKER_{index:02d}" in used:
+            index += 1
+        return f"SPEAKER_{index:02d}"
+    
     def _parse_results(self, diarized_result: Dict, audio_duration: float, processing_time: float) -> TranscriptionResult:
         """Parse WhisperX results into structured format."""
         segments = []
-        full_text_parts = []
         speakers = set()
         
         for segment_data in diarized_result.get("segments", []):
@@ -335,16 +1066,14 @@ class STTProcessor:
                 speaker_id=speaker_id,
                 text=segment_data["text"].strip(),
                 confidence=segment_data.get("avg_logprob", 0.0),
-                words=segment_data.get("words", [])
+                words=[Word.from_dict(word) for word in segment_data.get("words", [])]
             )
             
             segments.append(segment)
-            full_text_parts.append(f"[{speaker_id}]: {segment.text}")
         
         # Create final result
         result = TranscriptionResult(
             segments=segments,
-            full_text=" ".join(full_text_parts),
             speakers=list(speakers),
             audio_duration=audio_duration,
             processing_time=processing_time,
@@ -354,12 +1083,16 @@ class STTProcessor:
         
         return result
     
-    async def process_file(self, audio_path: Union[str, Path]) -> TranscriptionResult:
+    async def process_file(
+        self, audio_path: Union[str, Path], waveform: Optional[torch.Tensor] = None
+    ) -> TranscriptionResult:
         """
         Process audio file with full STT pipeline.
         
         Args:
             audio_path: Path to audio file
+            waveform: Already decoded 16kHz mono waveform (see load_audio); when
+                None the file is decoded here
             
         Returns:
             Complete transcription result with speaker diarization
@@ -372,19 +1105,27 @@ class STTProcessor:
             extra={"file_path": str(audio_path)}
         )
         
+        loop = asyncio.get_running_loop()
+        self._active_jobs += 1
+        
         try:
-            # Load models
-            self._load_whisper_model() 
-            self._load_whisperx_models()
+            # Load models, waiting on the background preload if it is still running
+            if self._load_future is not None and not self._load_future.done():
+                await asyncio.wrap_future(self._load_future)
+            await loop.run_in_executor(self._gpu_executor, self._load_whisperx_models)
             
-            # Preprocess audio
-            audio_data, sample_rate = self._preprocess_audio(audio_path)
-            audio_duration = len(audio_data) / sample_rate
+            # Preprocess audio, unless the caller decoded it ahead of time
+            if waveform is None:
+                audio_tensor, sample_rate = await loop.run_in_executor(
+                    self._cpu_executor, self._preprocess_audio, audio_path
+                )
+            else:
+                audio_tensor = torch.as_tensor(waveform, dtype=torch.float32, device=self.device)
+                sample_rate = 16000
+            audio_duration = audio_tensor.shape[0] / sample_rate
             
             # Transcription pipeline
-            transcription_result = self._transcribe_with_whisperx(audio_data)
-            aligned_result = self._align_transcription(transcription_result, audio_data)
-            diarized_result = self._perform_diarization(audio_data, aligned_result)
+            diarized_result = await self._run_pipeline(audio_tensor)
             
             # Parse results
             total_processing_time = time.time() - job_start_time
@@ -425,10 +1166,121 @@ class STTProcessor:
                 }
             )
             raise RuntimeError(error_msg) from e
+        
+        finally:
+            self._active_jobs -= 1
+            self._end_of_job_cleanup()
+    
+    async def process_audio(
+        self, waveform: torch.Tensor, audio_path: Union[str, Path]
+    ) -> TranscriptionResult:
+        """Process an already decoded waveform; audio_path identifies the source file."""
+        return await self.process_file(audio_path, waveform)
+    
+    async def process_batch(
+        self,
+        audio_paths: List[Union[str, Path]],
+        waveforms: Optional[List[Optional[torch.Tensor]]] = None
+    ) -> List[Union[TranscriptionResult, Exception]]:
+        """
+        Process several audio files concurrently.
+        
+        The files' VAD chunks go through the same coalescer, so they are decoded
+        together in shared Whisper batches.
+        
+        Args:
+            audio_paths: Paths to audio files, ideally of similar duration
+            waveforms: Optional pre-decoded waveforms aligned with audio_paths;
+                None entries are decoded here
+            
+        Returns:
+            One entry per input path, in order: the transcription result, or the
+            exception raised while processing that file
+        """
+        if waveforms is None:
+            waveforms = [None] * len(audio_paths)
+        
+        return await asyncio.gather(
+            *(
+                self.process_file(audio_path, waveform)
+                for audio_path, waveform in zip(audio_paths, waveforms)
+            ),
+            return_exceptions=True
+        )
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop owned by the synchronous wrappers, creating it if needed."""
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
     
     def process_file_sync(self, audio_path: Union[str, Path]) -> TranscriptionResult:
-        """Synchronous wrapper for process_file."""
-        return asyncio.run(self.process_file(audio_path))
+        """Synchronous wrapper for process_file, reusing one event loop across calls."""
+        return self._get_loop().run_until_complete(self.process_file(audio_path))
+    
+    def process_audio_sync(self, waveform: torch.Tensor, audio_path: Union[str, Path]) -> TranscriptionResult:
+        """Synchronous wrapper for process_audio."""
+        return self._get_loop().run_until_complete(self.process_audio(waveform, audio_path))
+    
+    def process_batch_sync(
+        self,
+        audio_paths: List[Union[str, Path]],
+        waveforms: Optional[List[Optional[torch.Tensor]]] = None
+    ) -> List[Union[TranscriptionResult, Exception]]:
+        """Synchronous wrapper for process_batch."""
+        return self._get_loop().run_until_complete(self.process_batch(audio_paths, waveforms))
+    
+    async def _warmup(self):
+        """Load models and run each stage once on a second of silence."""
+        loop = asyncio.get_running_loop()
+        if self._load_future is not None and not self._load_future.done():
+            await asyncio.wrap_future(self._load_future)
+        await loop.run_in_executor(self._gpu_executor, self._load_whisperx_models)
+        
+        audio_tensor = torch.zeros(16000, device=self.device)
+        
+        # Silence yields no VAD chunks, so feed the decoder directly
+        if self._supports_chunk_batching():
+            await loop.run_in_executor(self._gpu_executor, self._decode_chunk_batch, [audio_tensor])
+        else:
+            await loop.run_in_executor(self._gpu_executor, self._transcribe_file, audio_tensor)
+        
+        # A synthetic segment makes alignment run its model at least once
+        synthetic = {"segments": [{"text": "a", "start": 0.0, "end": 1.0}]}
+        aligned_result = await loop.run_in_executor(
+            self._gpu_executor, self._align_transcription, synthetic, audio_tensor
+        )
+        
+        await loop.run_in_executor(
+            self._gpu_executor, self._perform_diarization, audio_tensor, aligned_result
+        )
+    
+    def warmup(self):
+        """
+        Pay CUDA lazy initialization up front so the first real file runs at steady state.
+        
+        Creates the CUDA context, then runs the Whisper decoder, the alignment model
+        and diarization once each on one second of silence (bypassing VAD and using
+        a synthetic segment for alignment) so kernels are loaded and cuDNN
+        heuristics are cached before any timed job. No-op on CPU.
+        """
+        if self.device != "cuda":
+            return
+        
+        start_time = time.time()
+        
+        # Force CUDA context creation
+        torch.empty(1, device=self.device)
+        
+        try:
+            self._get_loop().run_until_complete(self._warmup())
+        except Exception as e:
+            # Warm-up is an optimization; real jobs will surface any actual failure
+            self.logger.warning(f"Warm-up inference failed: {str(e)}")
+        finally:
+            torch.cuda.synchronize()
+        
+        self.logger.info("CUDA warm-up completed", extra={"warmup_time": time.time() - start_time})
     
     def get_stats(self) -> Dict:
         """Get processing statistics."""
@@ -441,11 +1293,36 @@ class STTProcessor:
         """Clean up resources and models."""
         self.logger.info("Cleaning up STT processor resources")
         
+        # Stop chunk coalescer
+        if self._batcher_task is not None and not self._batcher_task.done():
+            self._batcher_task.cancel()
+            if self._batcher_loop is self._loop and not self._loop.is_running():
+                self._loop.run_until_complete(
+                    asyncio.gather(self._batcher_task, return_exceptions=True)
+                )
+        self._batcher_task = None
+        self._chunk_queue = None
+        self._batcher_loop = None
+        
+        # Close the event loop owned by process_file_sync
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+        self._loop = None
+        
+        # Stop background model loading
+        if self._load_executor is not None:
+            self._load_executor.shutdown(wait=True, cancel_futures=True)
+            self._load_executor = None
+            self._load_future = None
+        
+        # Drain pending stage work; fresh executors keep the processor reusable
+        self._gpu_executor.shutdown(wait=True)
+        self._diar_executor.shutdown(wait=True)
+        self._cpu_executor.shutdown(wait=True)
+        self._create_executors()
+        
         # Clear models
-        self.whisper_model = None
-        self.whisperx_model = None
-        self.align_model = None
-        self.diarize_model = None
+        self._unload_models()
         
         # GPU cleanup
         if torch.cuda.is_available():
@@ -455,7 +1332,11 @@ class STTProcessor:
         self.logger.info("STT processor cleanup completed")
     
     def __enter__(self):
-        """Context manager entry."""
+        """Context manager entry; loads all models up front when they are kept resident."""
+        if self.config.keep_models_loaded:
+            if self._load_future is not None:
+                self._load_future.result()
+            self._load_whisperx_models()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -3,12 +3,65 @@ Data models for STT processing pipeline.
 """
 
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+import time
 import uuid
 
+import numpy as np
 
-@dataclass
+
+def _ns_to_datetime(timestamp_ns: int) -> datetime:
+    """Convert a time.time_ns() timestamp to a timezone-aware UTC datetime."""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc)
+
+
+_WORD_FIELDS = frozenset({"word", "start", "end", "score", "speaker"})
+
+
+@dataclass(slots=True)
+class Word:
+    """Word-level timing from alignment; timing and score are None for unaligned tokens."""
+    
+    word: str
+    start: Optional[float] = None
+    end: Optional[float] = None
+    score: Optional[float] = None
+    speaker: Optional[str] = None
+    
+    # Backend-specific keys, passed through unchanged; None (not {}) keeps words small
+    extra: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Word":
+        """Create from a whisperx word dictionary."""
+        return cls(
+            word=data["word"],
+            start=data.get("start"),
+            end=data.get("end"),
+            score=data.get("score"),
+            speaker=data.get("speaker"),
+            extra={key: value for key, value in data.items() if key not in _WORD_FIELDS} or None
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization; unset fields are omitted, as whisperx does."""
+        data = {"word": self.word}
+        if self.start is not None:
+            data["start"] = self.start
+        if self.end is not None:
+            data["end"] = self.end
+        if self.score is not None:
+            data["score"] = self.score
+        if self.speaker is not None:
+            data["speaker"] = self.speaker
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
 class SpeakerSegment:
     """Represents a segment of audio with speaker information."""
     
@@ -17,13 +70,25 @@ class SpeakerSegment:
     speaker_id: str
     text: str
     confidence: float
-    words: List[Dict[str, Any]] = field(default_factory=list)
+    words: List[Word] = field(default_factory=list)
     
     @property
     def duration(self) -> float:
         """Duration of the segment in seconds."""
         return self.end_time - self.start_time
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpeakerSegment":
+        """Create from a dictionary produced by to_dict."""
+        return cls(
+            start_time=data["start_time"],
+            end_time=data["end_time"],
+            speaker_id=data["speaker_id"],
+            text=data["text"],
+            confidence=data["confidence"],
+            words=[Word.from_dict(word) for word in data.get("words", [])]
+        )
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
         return {
@@ -33,17 +98,16 @@ class SpeakerSegment:
             "text": self.text,
             "confidence": self.confidence,
             "duration": self.duration,
-            "words": self.words
+            "words": [word.to_dict() for word in self.words]
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionResult:
     """Complete transcription result with metadata."""
     
     # Core results
     segments: List[SpeakerSegment]
-    full_text: str
     speakers: List[str]
     
     # Metadata
@@ -54,38 +118,94 @@ class TranscriptionResult:
     
     # Processing info
     job_id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_ns: int = field(default_factory=time.time_ns)
     
     # Quality metrics
     overall_confidence: float = 0.0
     word_count: int = 0
     speaker_count: int = 0
     
+    # Segments grouped by speaker, built once in __post_init__
+    _by_speaker: Dict[str, List[SpeakerSegment]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    # Speaker-tagged transcript, built on first access to full_text
+    _full_text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Calculate derived metrics after initialization."""
+        by_speaker = defaultdict(list)
+        for seg in self.segments:
+            by_speaker[seg.speaker_id].append(seg)
+        self._by_speaker = dict(by_speaker)
+        
         if self.segments:
             # Calculate overall confidence as weighted average
-            total_duration = sum(seg.duration for seg in self.segments)
+            count = len(self.segments)
+            durations = np.fromiter(
+                (seg.end_time - seg.start_time for seg in self.segments),
+                dtype=np.float64,
+                count=count
+            )
+            confidences = np.fromiter(
+                (seg.confidence for seg in self.segments),
+                dtype=np.float64,
+                count=count
+            )
+            total_duration = durations.sum()
             if total_duration > 0:
-                self.overall_confidence = sum(
-                    seg.confidence * seg.duration for seg in self.segments
-                ) / total_duration
+                self.overall_confidence = float((confidences * durations).sum() / total_duration)
             
-            # Count words and speakers
-            self.word_count = len(self.full_text.split())
+            # Count words (aligned words when available) and speakers
+            self.word_count = sum(
+                len(seg.words) if seg.words else len(seg.text.split())
+                for seg in self.segments
+            )
             self.speaker_count = len(self.speakers)
     
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a UTC datetime."""
+        return _ns_to_datetime(self.created_ns)
+    
+    @property
+    def full_text(self) -> str:
+        """Full transcript with speaker tags, computed once from the segments."""
+        if self._full_text is None:
+            self._full_text = " ".join(
+                f"[{seg.speaker_id}]: {seg.text}" for seg in self.segments
+            )
+        return self._full_text
+    
     def get_speaker_segments(self, speaker_id: str) -> List[SpeakerSegment]:
         """Get all segments for a specific speaker."""
-        return [seg for seg in self.segments if seg.speaker_id == speaker_id]
+        return self._by_speaker.get(speaker_id, [])
     
     def get_transcript_by_speaker(self) -> Dict[str, str]:
         """Get full transcript organized by speaker."""
-        speaker_texts = {}
-        for speaker in self.speakers:
-            segments = self.get_speaker_segments(speaker)
-            speaker_texts[speaker] = " ".join(seg.text for seg in segments)
-        return speaker_texts
+        return {
+            speaker: " ".join(seg.text for seg in self._by_speaker.get(speaker, ()))
+            for speaker in self.speakers
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TranscriptionResult":
+        """Create from a dictionary produced by to_dict; derived fields are recomputed."""
+        created_at = datetime.fromisoformat(data["created_at"])
+        return cls(
+            segments=[SpeakerSegment.from_dict(seg) for seg in data["segments"]],
+            speakers=data["speakers"],
+            audio_duration=data["audio_duration"],
+            processing_time=data["processing_time"],
+            model_version=data["model_version"],
+            language=data.get("language", "pt"),
+            job_id=data["job_id"],
+            created_ns=int(created_at.timestamp() * 1_000_000) * 1000,
+            overall_confidence=data.get("overall_confidence", 0.0),
+            word_count=data.get("word_count", 0),
+            speaker_count=data.get("speaker_count", 0)
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -106,39 +226,54 @@ class TranscriptionResult:
         }
 
 
-@dataclass 
+@dataclass(slots=True)
 class ProcessingJob:
     """Represents a processing job with status tracking."""
     
     job_id: str
     file_path: str
     status: str = "pending"  # pending, processing, completed, failed
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    created_ns: int = field(default_factory=time.time_ns)
+    started_ns: Optional[int] = None
+    completed_ns: Optional[int] = None
     error_message: Optional[str] = None
     result: Optional[TranscriptionResult] = None
     
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a UTC datetime."""
+        return _ns_to_datetime(self.created_ns)
+    
+    @property
+    def started_at(self) -> Optional[datetime]:
+        """Start time as a UTC datetime."""
+        return _ns_to_datetime(self.started_ns) if self.started_ns is not None else None
+    
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        """Completion time as a UTC datetime."""
+        return _ns_to_datetime(self.completed_ns) if self.completed_ns is not None else None
+    
     def mark_started(self):
         """Mark job as started."""
         self.status = "processing"
-        self.started_at = datetime.utcnow()
+        self.started_ns = time.time_ns()
     
     def mark_completed(self, result: TranscriptionResult):
         """Mark job as completed with result."""
         self.status = "completed"
-        self.completed_at = datetime.utcnow()
+        self.completed_ns = time.time_ns()
         self.result = result
     
     def mark_failed(self, error: str):
         """Mark job as failed with error message."""
         self.status = "failed"
-        self.completed_at = datetime.utcnow()
+        self.completed_ns = time.time_ns()
         self.error_message = error
     
     @property
     def total_processing_time(self) -> Optional[float]:
         """Total processing time in seconds."""
-        if self.started_at and self.completed_at:
-            return (self.completed_at - self.started_at).total_seconds()
+        if self.started_ns is not None and self.completed_ns is not None:
+            return (self.completed_ns - self.started_ns) / 1e9
         return None
\ No newline at end of file
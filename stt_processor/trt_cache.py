@@ -0,0 +1,157 @@
+"""
+TensorRT engine cache for the alignment model.
+
+Compiling with torch_tensorrt takes minutes, so compiled engines are saved under
+the model cache directory and reloaded on later runs. Cache entries are keyed by
+model, GPU compute capability and compute type.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Bumped whenever the compiled input profile changes, so stale engines are rebuilt
+_ENGINE_VERSION = 2
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Expose a HuggingFace CTC model as a tensor-in/tensor-out module for export."""
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, waveform: torch.Tensor) -> torch.Tensor:
+        return self.model(waveform).logits
+
+
+class _LogitsOutput(torch.nn.Module):
+    """Wrap a compiled engine so callers can keep reading `model(x).logits`."""
+
+    def __init__(self, engine: torch.nn.Module):
+        super().__init__()
+        self.engine = engine
+
+    def forward(self, waveform: torch.Tensor) -> SimpleNamespace:
+        return SimpleNamespace(logits=self.engine(waveform))
+
+
+def _cache_paths(cache_dir: Path, model_key: str, compute_type: str) -> Tuple[Path, Path]:
+    """Return (engine_path, metadata_path) for a model on the current GPU and TensorRT build."""
+    import tensorrt
+    import torch_tensorrt
+
+    major, minor = torch.cuda.get_device_capability()
+    stem = (
+        f"{model_key.replace('/', '--')}-sm{major}{minor}-{compute_type}"
+        f"-trt{tensorrt.__version__}-torchtrt{torch_tensorrt.__version__}-v{_ENGINE_VERSION}"
+    )
+    return cache_dir / f"{stem}.ep", cache_dir / f"{stem}.json"
+
+
+def _tmp_path(path: Path) -> Path:
+    """Per-process temporary sibling of path, renamed into place once fully written."""
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+
+def load_cached_align_model(
+    cache_dir: Path, model_key: str, compute_type: str
+) -> Optional[Tuple[torch.nn.Module, Dict[str, Any]]]:
+    """
+    Load a previously compiled alignment engine and its metadata.
+
+    Args:
+        cache_dir: Directory holding compiled engines
+        model_key: Identifier of the alignment model (e.g. language code)
+        compute_type: Compute type the engine was built for
+
+    Returns:
+        Tuple of (model, metadata), or None when no engine is cached
+    """
+    engine_path, metadata_path = _cache_paths(cache_dir, model_key, compute_type)
+    if not (engine_path.exists() and metadata_path.exists()):
+        return None
+
+    import torch_tensorrt  # noqa: F401  (registers TensorRT runtime ops for deserialization)
+
+    try:
+        engine = torch.export.load(str(engine_path)).module()
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    except Exception as e:
+        # Damaged or incompatible entry; the caller recompiles and overwrites it
+        logger.warning(f"Ignoring unreadable TensorRT engine cache {engine_path}: {e}")
+        return None
+    logger.info(f"Loaded cached TensorRT alignment engine: {engine_path}")
+    return _LogitsOutput(engine), metadata
+
+
+def compile_align_model(
+    align_model: torch.nn.Module,
+    metadata: Dict[str, Any],
+    cache_dir: Path,
+    model_key: str,
+    compute_type: str,
+    max_seconds: int = 60
+) -> torch.nn.Module:
+    """
+    Compile a HuggingFace wav2vec2 alignment model with TensorRT and cache the engine.
+
+    Only HuggingFace CTC models are compiled; torchaudio pipelines return
+    (emissions, lengths) and are left as-is.
+
+    Args:
+        align_model: Alignment model returned by whisperx.load_align_model
+        metadata: Alignment metadata returned alongside the model
+        cache_dir: Directory holding compiled engines
+        model_key: Identifier of the alignment model (e.g. language code)
+        compute_type: Compute type used for the cache key
+        max_seconds: Longest segment (in seconds) the engine accepts
+
+    Returns:
+        Compiled model, or the original model when it cannot be compiled
+    """
+    if metadata.get("type") != "huggingface":
+        return align_model
+
+    import torch_tensorrt
+
+    engine_path, metadata_path = _cache_paths(cache_dir, model_key, compute_type)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    example = torch.randn(1, 30 * SAMPLE_RATE, device="cuda")
+    inputs = [
+        torch_tensorrt.Input(
+            min_shape=(1, 400),  # whisperx.align pads shorter segments to 400 samples
+            opt_shape=(1, 30 * SAMPLE_RATE),
+            max_shape=(1, max_seconds * SAMPLE_RATE),
+            dtype=torch.float32
+        )
+    ]
+    engine = torch_tensorrt.compile(
+        _LogitsOnly(align_model).eval(),
+        ir="dynamo",
+        inputs=inputs,
+        enabled_precisions={torch.float16}
+    )
+
+    # Write both files under temporary names and rename them into place, metadata
+    # first, so a crash never leaves a partial engine that looks valid
+    tmp_metadata_path = _tmp_path(metadata_path)
+    tmp_metadata_path.write_text(json.dumps(metadata), encoding="utf-8")
+    os.replace(tmp_metadata_path, metadata_path)
+
+    tmp_engine_path = _tmp_path(engine_path)
+    torch_tensorrt.save(engine, str(tmp_engine_path), output_format="exported_program", inputs=[example])
+    os.replace(tmp_engine_path, engine_path)
+    logger.info(f"Saved TensorRT alignment engine: {engine_path}")
+
+    return _LogitsOutput(engine)
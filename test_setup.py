@@ -4,10 +4,17 @@ Script de teste para verificar se todas as dependências estão instaladas corre
 para o Pipeline STT
 """
 
+import os
 import sys
 import importlib
-import torch
+import time
 import warnings
+from functools import lru_cache
+
+# Carregar kernels CUDA sob demanda; precisa ser definido antes de importar torch
+os.environ.setdefault("CUDA_MODULE_LOADING", "LAZY")
+
+import torch
 
 # Suprimir warnings desnecessários
 warnings.filterwarnings("ignore")
@@ -22,24 +29,28 @@ def test_import(module_name, description=""):
         print(f"❌ {module_name} - {description} - Error: {e}")
         return False
 
+@lru_cache(maxsize=1)
+def get_spacy_model(name="pt_core_news_lg"):
+    """Carrega o modelo spaCy uma única vez por processo"""
+    import spacy
+    return spacy.load(name)
+
 def test_models():
     """Testa se os modelos podem ser carregados"""
     print("\n🔍 Testando modelos...")
     
     # Teste do spaCy
     try:
-        import spacy
-        nlp = spacy.load("pt_core_news_lg")
+        nlp = get_spacy_model()
         print("✅ spaCy - Modelo português pt_core_news_lg carregado")
     except Exception as e:
         print(f"❌ spaCy - Erro ao carregar modelo português: {e}")
     
     # Teste do Whisper (modelo pequeno para teste rápido)
     try:
-        import whisper
+        import faster_whisper
         # Teste apenas se o modelo existe no cache
-        import os
-        whisper_cache = os.path.expanduser("~/.cache/whisper")
+        whisper_cache = os.path.expanduser("~/.cache/huggingface/hub")
         if os.path.exists(whisper_cache):
             print("✅ Whisper - Cache de modelos encontrado")
         else:
@@ -60,15 +71,39 @@ def test_pytorch():
     else:
         print("⚠️  CUDA não disponível - Usando CPU")
     
-    # Teste básico de tensor
+    # Teste básico de tensor (somente CPU, sem inicializar o contexto CUDA)
     try:
-        x = torch.randn(3, 3)
-        y = torch.randn(3, 3)
+        x = torch.randn(3, 3, device="cpu")
+        y = torch.randn(3, 3, device="cpu")
         z = torch.matmul(x, y)
         print("✅ PyTorch - Operações básicas funcionando")
     except Exception as e:
         print(f"❌ PyTorch - Erro em operações básicas: {e}")
 
+def test_gpu_warmup():
+    """Mede o tempo de inicialização da GPU (contexto CUDA + primeiro kernel)"""
+    if not torch.cuda.is_available():
+        return
+    
+    print("\n🔍 Testando aquecimento da GPU...")
+    
+    try:
+        start = time.perf_counter()
+        x = torch.randn(1024, 1024, device="cuda")
+        torch.matmul(x, x)
+        torch.cuda.synchronize()
+        warmup_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        torch.matmul(x, x)
+        torch.cuda.synchronize()
+        steady_time = time.perf_counter() - start
+        
+        print(f"✅ GPU - Aquecimento: {warmup_time:.2f}s (CUDA_MODULE_LOADING={os.environ['CUDA_MODULE_LOADING']})")
+        print(f"✅ GPU - Operação após aquecimento: {steady_time * 1000:.2f}ms")
+    except Exception as e:
+        print(f"❌ GPU - Erro no aquecimento: {e}")
+
 def main():
     """Função principal de teste"""
     print("🚀 Testando configuração do Pipeline STT\n")
@@ -77,7 +112,7 @@ def main():
     essential_modules = [
         ("torch", "PyTorch para computação tensorial"),
         ("torchaudio", "PyTorch Audio para processamento de áudio"),
-        ("whisper", "OpenAI Whisper para transcr,ição"),
+        ("faster_whisper", "faster-whisper (CTranslate2) para transcrição"),
         ("spacy", "spaCy para processamento de linguagem natural"),
         ("librosa", "Librosa para análise de áudio"),
         ("soundfile", "SoundFile para I/O de arquivos de áudio"),
@@ -117,6 +152,7 @@ def main():
     
     # Testes específicos
     test_pytorch()
+    test_gpu_warmup()
     test_models()
     
     print("\n" + "="*60)
@@ -14,21 +14,42 @@ Uso:
 
 import argparse
 import asyncio
+import contextlib
+import hashlib
 import json
+import mmap
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
+import orjson
+import soundfile as sf
 import typer
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
+from rich.traceback import Traceback
 
 from stt_processor import STTProcessor, STTConfig, TranscriptionResult
 
+# Extensões aceitas (minúsculas), montadas uma vez no import
+_SUPPORTED_AUDIO_EXTS: frozenset[str] = frozenset({".mp3", ".wav", ".m4a", ".flac", ".ogg", ".mp4", ".avi", ".mov"})
+_MAX_FILE_SIZE_BYTES = 500 << 20
+
+# Precisão da CLI -> compute_type do CTranslate2 ("auto" escolhe pelo dispositivo)
+PRECISION_TO_COMPUTE_TYPE = {
+    "auto": "auto",
+    "fp32": "float32",
+    "fp16": "float16",
+    "bf16": "bfloat16",
+    "int8": "int8"
+}
+
 # Rich console para output formatado
 console = Console()
 app = typer.Typer(
@@ -40,20 +61,21 @@ app = typer.Typer(
 
 def validate_audio_file(file_path: Path) -> bool:
     """Valida se o arquivo é um áudio válido."""
-    if not file_path.exists():
+    # Um único stat serve para existência e tamanho
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
         console.print(f"❌ Arquivo não encontrado: {file_path}", style="red")
         return False
     
-    supported_formats = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".mp4", ".avi", ".mov")
-    if file_path.suffix.lower() not in supported_formats:
+    if file_path.suffix.lower() not in _SUPPORTED_AUDIO_EXTS:
         console.print(f"❌ Formato não suportado: {file_path.suffix}", style="red")
-        console.print(f"Formatos aceitos: {', '.join(supported_formats)}", style="yellow")
+        console.print(f"Formatos aceitos: {', '.join(sorted(_SUPPORTED_AUDIO_EXTS))}", style="yellow")
         return False
     
-    # Verificar tamanho do arquivo
-    file_size_mb = file_path.stat().st_size / (1024 * 1024)
-    if file_size_mb > 500:
-        console.print(f"❌ Arquivo muito grande: {file_size_mb:.1f}MB (máximo: 500MB)", style="red")
+    # Verificar tamanho do arquivo (limite comparado em bytes, MB só para exibição)
+    if file_stat.st_size > _MAX_FILE_SIZE_BYTES:
+        console.print(f"❌ Arquivo muito grande: {file_stat.st_size >> 20}MB (máximo: 500MB)", style="red")
         return False
     
     return True
@@ -64,15 +86,23 @@ def find_audio_files(path: Path) -> List[Path]:
     if path.is_file():
         return [path] if validate_audio_file(path) else []
     
-    audio_files = []
-    supported_formats = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".mp4", ".avi", ".mov")
-    
-    for ext in supported_formats:
-        audio_files.extend(path.glob(f"*{ext}"))
-        audio_files.extend(path.glob(f"*{ext.upper()}"))
-    
-    # Validar arquivos encontrados
-    valid_files = [f for f in audio_files if validate_audio_file(f)]
+    # Uma única varredura do diretório, filtrando pela extensão
+    try:
+        with os.scandir(path) as entries:
+            audio_files = [
+                Path(entry.path) for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in _SUPPORTED_AUDIO_EXTS
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        # Caminho inexistente: cai na mensagem de erro abaixo
+        audio_files = []
+    
+    # Validar arquivos encontrados (stats em paralelo, útil em sistemas de arquivos de rede)
+    valid_files = []
+    if audio_files:
+        with ThreadPoolExecutor(max_workers=min(32, len(audio_files))) as executor:
+            mask = list(executor.map(validate_audio_file, audio_files))
+        valid_files = [f for f, is_valid in zip(audio_files, mask) if is_valid]
     
     if not valid_files:
         console.print(f"❌ Nenhum arquivo de áudio válido encontrado em: {path}", style="red")
@@ -80,6 +110,114 @@ def find_audio_files(path: Path) -> List[Path]:
     return sorted(valid_files)
 
 
+def get_audio_duration(file_path: Path) -> float:
+    """Lê a duração do áudio pelo cabeçalho, sem decodificar o arquivo."""
+    try:
+        return sf.info(str(file_path)).duration
+    except Exception:
+        # Formatos sem suporte no libsndfile vão para o final da ordenação
+        return float("inf")
+
+
+def group_by_duration(audio_files: List[Path], batch_size: int) -> List[List[Path]]:
+    """Agrupa arquivos de duração semelhante em lotes de até batch_size arquivos."""
+    if batch_size <= 1:
+        return [[audio_file] for audio_file in audio_files]
+    
+    by_duration = sorted(audio_files, key=get_audio_duration)
+    return [by_duration[i:i + batch_size] for i in range(0, len(by_duration), batch_size)]
+
+
+def config_fingerprint(config: STTConfig) -> str:
+    """Resume as opções que alteram o resultado da transcrição."""
+    relevant = {
+        "whisper_model": config.whisper_model,
+        "compute_type": config.get_compute_type(),
+        "backend": config.backend,
+        "language": config.language,
+        "task": config.task,
+        "vad_onset": config.vad_onset,
+        "vad_offset": config.vad_offset,
+        "num_speakers": config.num_speakers,
+        "min_speakers": config.min_speakers,
+        "max_speakers": config.max_speakers
+    }
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def cache_key(file_path: Path, fingerprint: str) -> str:
+    """Chave de cache: SHA-256 do conteúdo do áudio + configuração."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap não aceita arquivos vazios
+            return f"{hashlib.sha256().hexdigest()}-{fingerprint}"
+        
+        # Hash direto das páginas mapeadas: sem cópia para buffers do Python
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            digest = hashlib.sha256(mm).hexdigest()
+    return f"{digest}-{fingerprint}"
+
+
+def load_cached_result(cache_file: Path) -> Optional[TranscriptionResult]:
+    """Carrega um resultado salvo, ou None se não existir ou estiver corrompido."""
+    try:
+        with open(cache_file, "rb") as f:
+            return TranscriptionResult.from_dict(orjson.loads(f.read()))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        console.print(f"⚠️ Cache inválido ignorado: {cache_file}", style="yellow")
+        return None
+
+
+def store_cached_result(cache_file: Path, result: TranscriptionResult) -> None:
+    """Grava o resultado no cache de forma atômica."""
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(result.to_dict(), option=orjson.OPT_SERIALIZE_NUMPY))
+    os.replace(tmp_file, cache_file)
+
+
+async def _transcribe_async(
+    processor: STTProcessor,
+    batches: List[List[Path]],
+    run_batch: Callable[[List[Path], List[Optional[Any]]], List[Any]],
+    finish_batch: Callable[[List[Path], List[Any]], int]
+) -> int:
+    """
+    Executa os lotes com decodificação paralela na CPU e inferência serializada na GPU.
+    
+    run_batch roda sozinho na GPU; finish_batch (gravação e exibição) roda depois de
+    liberar a GPU, em paralelo com o lote seguinte. Retorna o total de arquivos
+    concluídos com sucesso.
+    """
+    cpu_sem = asyncio.Semaphore(os.cpu_count() or 1)
+    gpu_sem = asyncio.Semaphore(1)
+    # Lotes decodificados residentes ao mesmo tempo (atual + próximo), limita memória da GPU
+    ahead_sem = asyncio.Semaphore(2)
+    
+    async def decode(audio_file: Path):
+        async with cpu_sem:
+            try:
+                waveform, _ = await asyncio.to_thread(processor.load_audio, audio_file)
+                return waveform
+            except Exception:
+                # O processador decodifica de novo e reporta o erro no fluxo normal
+                return None
+    
+    async def process_one(batch: List[Path]) -> int:
+        async with ahead_sem:
+            waveforms = await asyncio.gather(*(decode(audio_file) for audio_file in batch))
+            async with gpu_sem:
+                results = await asyncio.to_thread(run_batch, batch, waveforms)
+        
+        return await asyncio.to_thread(finish_batch, batch, results)
+    
+    return sum(await asyncio.gather(*(process_one(batch) for batch in batches)))
+
+
 def format_duration(seconds: float) -> str:
     """Formata duração em segundos para formato legível."""
     mins, secs = divmod(int(seconds), 60)
@@ -93,8 +231,9 @@ def format_duration(seconds: float) -> str:
         return f"{secs}s"
 
 
-def display_transcription_summary(result: TranscriptionResult) -> None:
-    """Exibe resumo da transcrição de forma organizada."""
+def display_transcription_summary(result: TranscriptionResult, header: Optional[RenderableType] = None) -> None:
+    """Exibe resumo da transcrição de forma organizada, em uma única renderização."""
+    renderables = [header] if header is not None else []
     
     # Cabeçalho com métricas
     metrics_table = Table(title="📊 Métricas de Processamento", show_header=True)
@@ -109,8 +248,7 @@ def display_transcription_summary(result: TranscriptionResult) -> None:
     metrics_table.add_row("📝 Total de Palavras", str(result.word_count))
     metrics_table.add_row("🧠 Modelo", result.model_version)
     
-    console.print(metrics_table)
-    console.print()
+    renderables += [metrics_table, Text()]
     
     # Transcrição por speaker
     for speaker_id in result.speakers:
@@ -121,22 +259,26 @@ def display_transcription_summary(result: TranscriptionResult) -> None:
         speaker_text = " ".join(seg.text for seg in speaker_segments)
         
         panel_title = f"🎤 {speaker_id} - {format_duration(total_speaking_time)} de fala"
-        console.print(Panel(
-            speaker_text,
-            title=panel_title,
-            border_style="blue" if "SPEAKER_00" in speaker_id else "green"
-        ))
-        console.print()
+        renderables += [
+            Panel(
+                speaker_text,
+                title=panel_title,
+                border_style="blue" if "SPEAKER_00" in speaker_id else "green"
+            ),
+            Text()
+        ]
+    
+    console.print(Group(*renderables))
 
 
-def save_results(result: TranscriptionResult, output_path: Path, format_type: str) -> None:
-    """Salva os resultados em diferentes formatos."""
+def save_results(result: TranscriptionResult, output_path: Path, format_type: str) -> str:
+    """Salva os resultados em diferentes formatos e retorna a mensagem de confirmação."""
     
     if format_type == "json":
         output_file = output_path.with_suffix(".json")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
-        console.print(f"💾 Resultado salvo em: {output_file}", style="green")
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(result.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return f"💾 Resultado salvo em: {output_file}"
     
     elif format_type == "txt":
         output_file = output_path.with_suffix(".txt")
@@ -154,30 +296,33 @@ def save_results(result: TranscriptionResult, output_path: Path, format_type: st
                     timestamp = f"[{format_duration(segment.start_time)}-{format_duration(segment.end_time)}]"
                     f.write(f"{timestamp} {segment.text}\n")
         
-        console.print(f"💾 Transcrição salva em: {output_file}", style="green")
+        return f"💾 Transcrição salva em: {output_file}"
     
     elif format_type == "srt":
         output_file = output_path.with_suffix(".srt")
+        # Montar todas as legendas em memória e gravar de uma vez
+        lines = []
+        lines_append = lines.append
+        for subtitle_counter, segment in enumerate(result.segments, 1):
+            lines_append(
+                f"{subtitle_counter}\n"
+                f"{format_srt_timestamp(segment.start_time)} --> {format_srt_timestamp(segment.end_time)}\n"
+                f"[{segment.speaker_id}]: {segment.text}\n\n"
+            )
+        
         with open(output_file, 'w', encoding='utf-8') as f:
-            subtitle_counter = 1
-            for segment in result.segments:
-                start_time = format_srt_timestamp(segment.start_time)
-                end_time = format_srt_timestamp(segment.end_time)
-                
-                f.write(f"{subtitle_counter}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"[{segment.speaker_id}]: {segment.text}\n\n")
-                subtitle_counter += 1
+            f.write("".join(lines))
         
-        console.print(f"💾 Legenda salva em: {output_file}", style="green")
+        return f"💾 Legenda salva em: {output_file}"
 
 
 def format_srt_timestamp(seconds: float) -> str:
     """Formata timestamp para formato SRT."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    milliseconds = int((seconds % 1) * 1000)
+    # Aritmética inteira em milissegundos evita erros de arredondamento do float
+    milliseconds = int(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    secs, milliseconds = divmod(milliseconds, 1000)
     
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
 
@@ -191,8 +336,11 @@ def transcribe(
     min_speakers: Optional[int] = typer.Option(None, "--min-speakers", help="Número mínimo de speakers"),
     max_speakers: Optional[int] = typer.Option(None, "--max-speakers", help="Número máximo de speakers"),
     model: str = typer.Option("large-v3", "--model", "-m", help="Modelo Whisper: tiny, base, small, medium, large, large-v3"),
+    precision: str = typer.Option("auto", "--precision", "-p", help="Precisão: auto, fp32, fp16, bf16, int8"),
     device: str = typer.Option("auto", "--device", "-d", help="Dispositivo: auto, cpu, cuda"),
     language: str = typer.Option("pt", "--language", "-l", help="Idioma: pt, en, es, auto"),
+    batch_size: int = typer.Option(1, "--batch-size", "-b", help="Arquivos de duração semelhante processados juntos na GPU"),
+    cache_dir: str = typer.Option("", "--cache-dir", help="Cache de resultados por conteúdo do áudio (desativado por padrão; ATENÇÃO: grava as transcrições completas em texto puro, ex.: ~/.cache/pipeline-stt)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Modo verboso"),
     quiet: bool = typer.Option(False, "--quiet", "-q", help="Modo silencioso")
 ):
@@ -206,20 +354,30 @@ def transcribe(
         transcribe audios/ --speakers 2 --format json
         
         transcribe entrevista.wav --min-speakers 2 --max-speakers 4
+        
+        transcribe audios/ --batch-size 4 --precision fp16
+        
+        transcribe audios/ --cache-dir ~/.cache/pipeline-stt
     """
     
     if quiet and verbose:
         console.print("❌ Não é possível usar --quiet e --verbose ao mesmo tempo", style="red")
         raise typer.Exit(1)
     
+    if precision not in PRECISION_TO_COMPUTE_TYPE:
+        console.print("❌ Precisão inválida. Use: auto, fp32, fp16, bf16, int8", style="red")
+        raise typer.Exit(1)
+    
     # Configuração
     config = STTConfig(
         whisper_model=model,
         whisper_device=device,
+        compute_type=PRECISION_TO_COMPUTE_TYPE[precision],
         language=language,
         num_speakers=speakers,
         min_speakers=min_speakers,
         max_speakers=max_speakers,
+        keep_models_loaded=True,  # modelos carregados uma vez para todos os arquivos
         log_level="DEBUG" if verbose else "WARNING" if quiet else "INFO"
     )
     
@@ -250,40 +408,115 @@ def transcribe(
     # Processar arquivos
     total_start_time = time.time()
     successful_files = 0
-    
-    with STTProcessor(config) as processor:
-        for i, audio_file in enumerate(audio_files, 1):
-            if not quiet:
-                console.print(f"📁 [{i}/{len(audio_files)}] Processando: {audio_file.name}", style="bold")
+    processed_files = 0
+    pending_files = audio_files
+    
+    # Reaproveitar resultados de arquivos já transcritos com a mesma configuração
+    cache_path = Path(cache_dir).expanduser() if cache_dir else None
+    if cache_path is not None:
+        try:
+            cache_path.mkdir(parents=True, exist_ok=True)
+            fingerprint = config_fingerprint(config)
+            with ThreadPoolExecutor(max_workers=min(32, len(audio_files))) as executor:
+                keys = list(executor.map(lambda f: cache_key(f, fingerprint), audio_files))
+            cache_files = {f: cache_path / f"{key}.json" for f, key in zip(audio_files, keys)}
+        except OSError as e:
+            console.print(f"⚠️ Cache desativado: {e}", style="yellow")
+            cache_path = None
+    
+    if cache_path is not None:
+        pending_files = []
+        for audio_file in audio_files:
+            result = load_cached_result(cache_files[audio_file])
+            if result is None:
+                pending_files.append(audio_file)
+                continue
             
+            processed_files += 1
             try:
-                # Processar arquivo
-                with Progress(
+                saved_message = save_results(result, output_path / audio_file.stem, format_type)
+                if quiet:
+                    console.print(saved_message, style="green")
+                else:
+                    display_transcription_summary(result, header=Text.assemble(
+                        (f"♻️ [{processed_files}/{len(audio_files)}] Em cache: {audio_file.name}\n", "bold"),
+                        (saved_message, "green")
+                    ))
+                successful_files += 1
+            except Exception as e:
+                console.print(f"❌ Erro ao processar {audio_file.name}: {str(e)}", style="red")
+                if verbose:
+                    console.print(Traceback.from_exception(type(e), e, e.__traceback__))
+    
+    if pending_files:
+        with STTProcessor(config) as processor:
+            # Aquecer CUDA para que o primeiro arquivo não pague a inicialização
+            if config.get_device() == "cuda":
+                if not quiet:
+                    console.print("🔥 Aquecendo GPU...", style="dim")
+                processor.warmup()
+            
+            def run_batch(batch, waveforms):
+                nonlocal processed_files
+                
+                if not quiet:
+                    console.print("\n".join(
+                        f"📁 [{i}/{len(audio_files)}] Processando: {audio_file.name}"
+                        for i, audio_file in enumerate(batch, processed_files + 1)
+                    ), style="bold")
+                processed_files += len(batch)
+                
+                # Processar lote (arquivos do lote compartilham os batches do Whisper)
+                progress_cm = Progress(
                     SpinnerColumn(),
                     TextColumn("[progress.description]{task.description}"),
                     BarColumn(),
                     TimeElapsedColumn(),
-                    console=console,
-                    disable=quiet
-                ) as progress:
-                    
-                    task = progress.add_task("Transcrevendo...", total=None)
-                    result = processor.process_file_sync(audio_file)
-                
-                # Salvar resultado
-                output_file_path = output_path / audio_file.stem
-                save_results(result, output_file_path, format_type)
-                
-                if not quiet:
-                    display_transcription_summary(result)
-                
-                successful_files += 1
+                    console=console
+                ) if not quiet else contextlib.nullcontext()
                 
-            except Exception as e:
-                console.print(f"❌ Erro ao processar {audio_file.name}: {str(e)}", style="red")
-                if verbose:
-                    console.print_exception()
-                continue
+                with progress_cm as progress:
+                    if not quiet:
+                        progress.add_task("Transcrevendo...", total=None)
+                    return processor.process_batch_sync(batch, waveforms)
+            
+            def finish_batch(batch, results):
+                finished = 0
+                for audio_file, result in zip(batch, results):
+                    try:
+                        if isinstance(result, Exception):
+                            raise result
+                        
+                        # Salvar resultado
+                        output_file_path = output_path / audio_file.stem
+                        saved_message = save_results(result, output_file_path, format_type)
+                        
+                        if quiet:
+                            console.print(saved_message, style="green")
+                        else:
+                            display_transcription_summary(result, header=Text(saved_message, style="green"))
+                        
+                        finished += 1
+                        
+                    except Exception as e:
+                        console.print(f"❌ Erro ao processar {audio_file.name}: {str(e)}", style="red")
+                        if verbose:
+                            console.print(Traceback.from_exception(type(e), e, e.__traceback__))
+                        continue
+                    
+                    # Falha no cache não invalida o arquivo já salvo
+                    if cache_path is not None:
+                        try:
+                            store_cached_result(cache_files[audio_file], result)
+                        except Exception as e:
+                            console.print(f"⚠️ Não foi possível gravar o cache de {audio_file.name}: {e}", style="yellow")
+                return finished
+            
+            successful_files += asyncio.run(
+                _transcribe_async(
+                    processor, group_by_duration(pending_files, batch_size), run_batch, finish_batch
+                )
+            )
     
     # Resumo final
     total_time = time.time() - total_start_time
@@ -299,6 +532,7 @@ def transcribe(
         summary_table.add_row("Tempo Total", format_duration(total_time))
         summary_table.add_row("Formato de Saída", format_type.upper())
         summary_table.add_row("Modelo Usado", model)
+        summary_table.add_row("Precisão", config.get_compute_type())
         
         console.print(summary_table)
         